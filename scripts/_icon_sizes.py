@@ -0,0 +1,21 @@
+"""
+图标输出清单：(文件名, 边长) 元组，三个生成脚本共享同一份
+按尺寸从大到小排序，并行渲染时大任务先提交，负载更均衡
+"""
+
+SIZES = tuple(sorted({
+    'icon.png': 512,
+    '32x32.png': 32,
+    '128x128.png': 128,
+    '128x128@2x.png': 256,
+    'Square30x30Logo.png': 30,
+    'Square44x44Logo.png': 44,
+    'Square71x71Logo.png': 71,
+    'Square89x89Logo.png': 89,
+    'Square107x107Logo.png': 107,
+    'Square142x142Logo.png': 142,
+    'Square150x150Logo.png': 150,
+    'Square284x284Logo.png': 284,
+    'Square310x310Logo.png': 310,
+    'StoreLogo.png': 50,
+}.items(), key=lambda x: -x[1]))
@@ -1,49 +1,78 @@
 """
 将 SVG 图标转换为所有需要的格式
-需要安装: pip install cairosvg pillow
+需要安装: pip install -r scripts/requirements-dev.txt
+（x86-64 机器可选装 Pillow-SIMD 加速，见 requirements-dev.txt 说明）
 """
 
-import cairosvg
+from cairosvg.parser import Tree
+from cairosvg.surface import PNGSurface
+from concurrent.futures import ThreadPoolExecutor
+from _icon_sizes import SIZES
 from PIL import Image
+import functools
 import io
 import os
+import struct
 
-def svg_to_png(svg_path, png_path, size):
-    """将 SVG 转换为指定尺寸的 PNG"""
-    png_data = cairosvg.svg2png(
-        url=svg_path,
-        output_width=size,
-        output_height=size
+# ICNS 块头：4字节类型代码 + 4字节大端长度
+ICNS_HEADER = struct.Struct('>4sI')
+
+# 解析后的 SVG 语法树（全局共享，所有尺寸的渲染复用同一次解析）
+_tree = None
+
+def load_svg(svg_path):
+    """只解析一次 SVG，之后所有渲染共享这棵语法树"""
+    global _tree
+    _tree = Tree(url=svg_path)
+    render_png.cache_clear()
+    render_image.cache_clear()
+
+@functools.lru_cache(maxsize=None)
+def render_png(size):
+    """渲染指定尺寸的 PNG 字节（共享解析树，同尺寸只渲染一次）"""
+    output = io.BytesIO()
+    PNGSurface(_tree, output, 96, output_width=size, output_height=size).finish()
+    return output.getvalue()
+
+@functools.lru_cache(maxsize=None)
+def render_image(size):
+    """渲染为 PIL Image：直接读取 cairo 表面的原始像素，跳过 PNG 编解码
+
+    cairo 的 ARGB32 是小端预乘 alpha，对应 Pillow 的 'BGRa' 原始模式。
+    """
+    surface = PNGSurface(_tree, None, 96, output_width=size, output_height=size)
+    cairo_surface = surface.cairo
+    return Image.frombuffer(
+        'RGBA',
+        (cairo_surface.get_width(), cairo_surface.get_height()),
+        bytes(cairo_surface.get_data()),
+        'raw', 'BGRa', cairo_surface.get_stride(), 1
     )
-    
+
+def svg_to_png(png_path, size):
+    """将 SVG 转换为指定尺寸的 PNG"""
+    png_data = render_png(size)
+
     # 保存 PNG
     with open(png_path, 'wb') as f:
         f.write(png_data)
-    
+
     return png_path
 
-def create_ico_from_svg(svg_path, ico_path):
+def create_ico_from_svg(ico_path):
     """从 SVG 创建 ICO 文件"""
     sizes = [(16, 16), (32, 32), (48, 48), (64, 64), (128, 128), (256, 256)]
     images = []
-    
+
     for size in sizes:
-        png_data = cairosvg.svg2png(
-            url=svg_path,
-            output_width=size[0],
-            output_height=size[1]
-        )
-        img = Image.open(io.BytesIO(png_data))
-        images.append(img)
-    
+        images.append(render_image(size[0]))
+
     # 保存为 ICO
     images[0].save(ico_path, format='ICO', sizes=sizes, append_images=images[1:])
     print(f"✓ 生成 icon.ico")
 
-def create_icns_from_svg(svg_path, icns_path):
+def create_icns_from_svg(icns_path):
     """从 SVG 创建 ICNS 文件"""
-    import struct
-    
     icon_types = [
         (512, b'ic09'),
         (256, b'ic08'),
@@ -51,27 +80,18 @@ def create_icns_from_svg(svg_path, icns_path):
         (32, b'ic11'),
         (16, b'ic04'),
     ]
-    
-    icon_data = []
-    
+
+    # ICNS 块格式：4字节类型 + 4字节长度 + 数据
+    chunks = []
     for size, type_code in icon_types:
-        png_data = cairosvg.svg2png(
-            url=svg_path,
-            output_width=size,
-            output_height=size
-        )
-        
-        chunk_size = 8 + len(png_data)
-        chunk = type_code + struct.pack('>I', chunk_size) + png_data
-        icon_data.append(chunk)
-    
+        png_data = render_png(size)
+        chunks.append(ICNS_HEADER.pack(type_code, 8 + len(png_data)) + png_data)
+
+    # 整个文件拼成一个缓冲区，一次写入
+    payload = b''.join(chunks)
     with open(icns_path, 'wb') as f:
-        total_size = 8 + sum(len(chunk) for chunk in icon_data)
-        f.write(b'icns')
-        f.write(struct.pack('>I', total_size))
-        for chunk in icon_data:
-            f.write(chunk)
-    
+        f.write(ICNS_HEADER.pack(b'icns', 8 + len(payload)) + payload)
+
     print(f"✓ 生成 icon.icns")
 
 def main():
@@ -83,38 +103,30 @@ def main():
         return
     
     print("🎨 从 SVG 生成所有图标格式...\n")
-    
-    # 生成各种尺寸的 PNG
-    sizes = {
-        'icon.png': 512,
-        '32x32.png': 32,
-        '128x128.png': 128,
-        '128x128@2x.png': 256,
-        'Square30x30Logo.png': 30,
-        'Square44x44Logo.png': 44,
-        'Square71x71Logo.png': 71,
-        'Square89x89Logo.png': 89,
-        'Square107x107Logo.png': 107,
-        'Square142x142Logo.png': 142,
-        'Square150x150Logo.png': 150,
-        'Square284x284Logo.png': 284,
-        'Square310x310Logo.png': 310,
-        'StoreLogo.png': 50,
-    }
-    
+
+    # 只解析一次 SVG，后续所有渲染复用同一棵语法树
+    load_svg(svg_path)
+
     print("📦 生成 PNG 文件...")
-    for filename, size in sizes.items():
-        output_path = os.path.join(icons_dir, filename)
-        svg_to_png(svg_path, output_path, size)
-        print(f"  ✓ {filename} ({size}x{size})")
+
+    def render_task(task):
+        filename, size = task
+        svg_to_png(os.path.join(icons_dir, filename), size)
+        return filename, size
+
+    # cairosvg 进入 libcairo 后会释放 GIL，线程池即可并行光栅化，
+    # 解析树直接在线程间共享，没有进程池的序列化开销
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        for filename, size in executor.map(render_task, SIZES):
+            print(f"  ✓ {filename} ({size}x{size})")
     
     print("\n🪟 生成 Windows ICO...")
     ico_path = os.path.join(icons_dir, 'icon.ico')
-    create_ico_from_svg(svg_path, ico_path)
+    create_ico_from_svg(ico_path)
     
     print("\n🍎 生成 macOS ICNS...")
     icns_path = os.path.join(icons_dir, 'icon.icns')
-    create_icns_from_svg(svg_path, icns_path)
+    create_icns_from_svg(icns_path)
     
     print("\n✨ 所有图标生成完成！")
     print(f"📁 输出目录: {icons_dir}")
@@ -8,6 +8,9 @@ import os
 import struct
 import io
 
+# ICNS 块头：4字节类型代码 + 4字节大端长度
+ICNS_HEADER = struct.Struct('>4sI')
+
 def create_icns_manually(png_path, icns_path):
     """手动创建 ICNS 文件（跨平台）"""
     
@@ -24,36 +27,29 @@ def create_icns_manually(png_path, icns_path):
     
     # 存储所有图标数据
     icon_data = []
-    
+
     print(f"🔨 手动打包 ICNS 文件...")
-    
+
     for size, type_code in icon_types:
         # 调整图片大小
         resized = img.resize((size, size), Image.Resampling.LANCZOS)
-        
+
         # 转换为 PNG 字节流
         png_buffer = io.BytesIO()
         resized.save(png_buffer, format='PNG')
         png_bytes = png_buffer.getvalue()
-        
+
         # ICNS 块格式：4字节类型 + 4字节长度 + 数据
-        chunk_size = 8 + len(png_bytes)
-        chunk = type_code + struct.pack('>I', chunk_size) + png_bytes
-        
-        icon_data.append(chunk)
+        icon_data.append(ICNS_HEADER.pack(type_code, 8 + len(png_bytes)) + png_bytes)
         print(f"  ✓ {size}x{size} ({type_code.decode()}) - {len(png_bytes)} bytes")
-    
-    # 写入 ICNS 文件
+
+    # 整个文件拼成一个缓冲区，一次写入
+    # ICNS 文件头：'icns' + 总大小
+    payload = b''.join(icon_data)
+    total_size = 8 + len(payload)
     with open(icns_path, 'wb') as f:
-        # ICNS 文件头：'icns' + 总大小
-        total_size = 8 + sum(len(chunk) for chunk in icon_data)
-        f.write(b'icns')
-        f.write(struct.pack('>I', total_size))
-        
-        # 写入所有图标块
-        for chunk in icon_data:
-            f.write(chunk)
-    
+        f.write(ICNS_HEADER.pack(b'icns', total_size) + payload)
+
     print(f"\n✅ 成功生成 ICNS: {icns_path}")
     print(f"   文件大小: {total_size} bytes")
 
@@ -4,8 +4,28 @@ iLauncher 图标生成器
 """
 
 from PIL import Image, ImageDraw, ImageFont
+from concurrent.futures import ProcessPoolExecutor
+from _icon_sizes import SIZES
+import argparse
+import math
+import numpy as np
 import os
 
+# 45° 方向向量：手柄固定沿 45° 角，预先算好避免每次渲染重复三角求值
+COS45 = SIN45 = math.cos(math.pi / 4)
+
+# 输出目录（模块级，进程池工作函数需要访问）
+ICONS_DIR = os.path.join(os.path.dirname(__file__), '..', 'src-tauri', 'icons')
+
+# 主画布尺寸：只在该尺寸绘制一次，其余输出全部由它缩放得到
+MASTER_SIZE = 512
+
+# 径向渐变查表：256 级，中心亮蓝 (96,165,250) -> 边缘深蓝紫 (59,130,246)
+GRADIENT_LUT = np.linspace([96, 165, 250], [59, 130, 246], 256).astype(np.uint8)
+
+# 进程池中每个工作进程持有的主画布副本
+_master = None
+
 def create_ilauncher_icon(size):
     """创建 iLauncher 图标 - 极简现代风格
     
@@ -14,58 +34,47 @@ def create_ilauncher_icon(size):
     - 优雅的搜索图标
     - 闪电符号代表快速
     """
-    # 创建透明背景
-    img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
-    
     center = size // 2
     padding = size // 10
-    
+
     # === 背景：现代渐变圆形 ===
-    # 创建从中心向外的径向渐变效果
-    for i in range(100, 0, -1):
-        ratio = i / 100
-        radius = int((size // 2 - padding) * ratio)
-        
-        # 从深蓝紫色渐变到亮蓝色
-        r = int(59 + (96 - 59) * (1 - ratio))      # 59 -> 96
-        g = int(130 + (165 - 130) * (1 - ratio))   # 130 -> 165
-        b = int(246 + (250 - 246) * (1 - ratio))   # 246 -> 250
-        alpha = 255
-        
-        draw.ellipse(
-            [center - radius, center - radius, center + radius, center + radius],
-            fill=(r, g, b, alpha)
-        )
-    
+    # 用 NumPy 一次性生成径向渐变：距离场量化成 256 级后查 GRADIENT_LUT，
+    # 替代逐环 draw.ellipse 的重复覆盖和逐像素浮点插值
+    bg_radius = size // 2 - padding
+    yy, xx = np.ogrid[:size, :size]
+    dist = np.hypot(xx - center, yy - center)
+    idx = np.clip(dist / bg_radius * 255, 0, 255).astype(np.uint8)
+    rgba = np.empty((size, size, 4), dtype=np.uint8)
+    rgba[..., :3] = GRADIENT_LUT[idx]
+    rgba[..., 3] = np.where(dist <= bg_radius, 255, 0)
+
+    img = Image.fromarray(rgba, 'RGBA')
+    draw = ImageDraw.Draw(img)
+
     # === 主图标：优雅的搜索放大镜 ===
     # 放大镜参数
     mag_radius = int(size * 0.22)
     mag_thickness = max(3, size // 24)
     mag_center_offset = -int(size * 0.06)
     
-    # 放大镜镜片（圆环）
-    for thickness in range(mag_thickness):
-        draw.ellipse(
-            [center + mag_center_offset - mag_radius + thickness,
-             center + mag_center_offset - mag_radius + thickness,
-             center + mag_center_offset + mag_radius - thickness,
-             center + mag_center_offset + mag_radius - thickness],
-            outline=(255, 255, 255, 255),
-            width=1
-        )
+    # 放大镜镜片（圆环），Pillow 原生支持粗描边，一次绘制即可
+    draw.ellipse(
+        [center + mag_center_offset - mag_radius,
+         center + mag_center_offset - mag_radius,
+         center + mag_center_offset + mag_radius,
+         center + mag_center_offset + mag_radius],
+        outline=(255, 255, 255, 255),
+        width=mag_thickness
+    )
     
-    # 放大镜手柄（圆角矩形）
+    # 放大镜手柄（圆角矩形），沿 45° 方向伸出
     handle_length = int(size * 0.25)
     handle_width = mag_thickness
-    handle_start_angle = 45  # 45度角
-    
-    import math
-    angle_rad = math.radians(handle_start_angle)
-    handle_start_x = center + mag_center_offset + int(mag_radius * math.cos(angle_rad))
-    handle_start_y = center + mag_center_offset + int(mag_radius * math.sin(angle_rad))
-    handle_end_x = handle_start_x + int(handle_length * math.cos(angle_rad))
-    handle_end_y = handle_start_y + int(handle_length * math.sin(angle_rad))
+
+    handle_start_x = center + mag_center_offset + int(mag_radius * COS45)
+    handle_start_y = center + mag_center_offset + int(mag_radius * SIN45)
+    handle_end_x = handle_start_x + int(handle_length * COS45)
+    handle_end_y = handle_start_y + int(handle_length * SIN45)
     
     # 绘制圆润的手柄
     draw.line(
@@ -119,56 +128,73 @@ def create_ilauncher_icon(size):
     
     return img
 
-def create_ico_file(png_path, ico_path):
-    """将 PNG 转换为 ICO（多尺寸）"""
-    img = Image.open(png_path)
+def create_ico_file(master, ico_path):
+    """将内存中的主画布转换为 ICO（多尺寸）"""
     sizes = [(16, 16), (32, 32), (48, 48), (64, 64), (128, 128), (256, 256)]
-    
+
     # 创建多尺寸图标
     icon_images = []
     for size in sizes:
-        resized = img.resize(size, Image.Resampling.LANCZOS)
+        resized = master.resize(size, Image.Resampling.LANCZOS)
         icon_images.append(resized)
-    
+
     # 保存为 ICO
     icon_images[0].save(ico_path, format='ICO', sizes=sizes, append_images=icon_images[1:])
 
-def main():
+def init_worker(master_bytes):
+    """进程池初始化：还原主画布供本进程所有任务复用"""
+    global _master
+    _master = Image.frombytes('RGBA', (MASTER_SIZE, MASTER_SIZE), master_bytes)
+
+def render_one(task):
+    """将主画布缩放到单个尺寸并保存（进程池工作函数）"""
+    filename, size = task
+    if size == MASTER_SIZE:
+        icon = _master
+    else:
+        icon = _master.resize((size, size), Image.Resampling.LANCZOS)
+    # 批量输出用最低压缩档，省下的是纯 CPU 时间；icon.png 随后会重新压缩
+    icon.save(os.path.join(ICONS_DIR, filename), 'PNG', compress_level=1)
+    return filename, size
+
+def render_one_hifi(task):
+    """逐尺寸独立重绘并保存（--high-fidelity 模式的进程池工作函数）"""
+    filename, size = task
+    icon = create_ilauncher_icon(size)
+    icon.save(os.path.join(ICONS_DIR, filename), 'PNG', compress_level=1)
+    return filename, size
+
+def main(high_fidelity=False):
     # 输出目录
-    icons_dir = os.path.join(os.path.dirname(__file__), '..', 'src-tauri', 'icons')
+    icons_dir = ICONS_DIR
     os.makedirs(icons_dir, exist_ok=True)
     
     print("🎨 开始生成 iLauncher 图标...")
-    
-    # 生成各种尺寸的 PNG
-    sizes = {
-        'icon.png': 512,
-        '32x32.png': 32,
-        '128x128.png': 128,
-        '128x128@2x.png': 256,
-        'Square30x30Logo.png': 30,
-        'Square44x44Logo.png': 44,
-        'Square71x71Logo.png': 71,
-        'Square89x89Logo.png': 89,
-        'Square107x107Logo.png': 107,
-        'Square142x142Logo.png': 142,
-        'Square150x150Logo.png': 150,
-        'Square284x284Logo.png': 284,
-        'Square310x310Logo.png': 310,
-        'StoreLogo.png': 50,
-    }
-    
-    for filename, size in sizes.items():
-        icon = create_ilauncher_icon(size)
-        output_path = os.path.join(icons_dir, filename)
-        icon.save(output_path, 'PNG')
-        print(f"✓ 生成 {filename} ({size}x{size})")
-    
-    # 生成 ICO 文件（Windows）
-    print("\n🪟 生成 Windows ICO 文件...")
+
+    # 所有输出都是同一幅图，只在最大尺寸绘制一次，其余尺寸用 LANCZOS 缩放
+    master = create_ilauncher_icon(MASTER_SIZE)
+
+    if high_fidelity:
+        # 每个尺寸独立重绘（慢，但每个输出都是原生绘制而非缩放）
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            for filename, size in executor.map(render_one_hifi, SIZES, chunksize=1):
+                print(f"✓ 生成 {filename} ({size}x{size})")
+    else:
+        # 缩放与保存互相独立，用进程池并行处理；SIZES 已按大尺寸优先排序
+        with ProcessPoolExecutor(max_workers=os.cpu_count(),
+                                 initializer=init_worker,
+                                 initargs=(master.tobytes(),)) as executor:
+            for filename, size in executor.map(render_one, SIZES, chunksize=1):
+                print(f"✓ 生成 {filename} ({size}x{size})")
+    
+    # 正式对外的 icon.png 用最高压缩档重新保存一次
     base_icon_path = os.path.join(icons_dir, 'icon.png')
+    master.save(base_icon_path, 'PNG', compress_level=9, optimize=True)
+
+    # 生成 ICO 文件（Windows），直接复用内存中的主画布
+    print("\n🪟 生成 Windows ICO 文件...")
     ico_path = os.path.join(icons_dir, 'icon.ico')
-    create_ico_file(base_icon_path, ico_path)
+    create_ico_file(master, ico_path)
     print(f"✓ 生成 icon.ico")
     
     # 生成 ICNS 文件（macOS）需要额外工具
@@ -181,4 +207,8 @@ def main():
     print(f"📁 输出目录: {icons_dir}")
 
 if __name__ == '__main__':
-    main()
+    parser = argparse.ArgumentParser(description='生成 iLauncher 图标')
+    parser.add_argument('--high-fidelity', action='store_true',
+                        help='每个尺寸独立重绘，而不是从主画布缩放')
+    args = parser.parse_args()
+    main(high_fidelity=args.high_fidelity)
@@ -3,41 +3,58 @@
 不依赖 cairosvg，纯 Python 实现
 """
 
-from PIL import Image, ImageDraw, ImageFilter
+from PIL import Image, ImageDraw
+from concurrent.futures import ProcessPoolExecutor
+from _icon_sizes import SIZES
+import argparse
+import math
+import numpy as np
 import os
 import struct
 import io
 
+# 45° 方向向量：手柄固定沿 45° 角，预先算好避免每次渲染重复三角求值
+COS45 = SIN45 = math.cos(math.pi / 4)
+
+# 输出目录（模块级，进程池工作函数需要访问）
+ICONS_DIR = os.path.join(os.path.dirname(__file__), '..', 'src-tauri', 'icons')
+
+# ICNS 块头：4字节类型代码 + 4字节大端长度
+ICNS_HEADER = struct.Struct('>4sI')
+
+# 主画布尺寸：固定按 1024 绘制一次（相当于最大输出 512 的 2 倍超采样），
+# 其余输出全部由它缩放得到
+MASTER_SIZE = 1024
+
+# 进程池中每个工作进程持有的主画布副本
+_master = None
+
+# 背景渐变查表：256 级，深空蓝 #2952E8 (过渡带外缘) -> 电光蓝 #6366F1 (内部)
+GRADIENT_LUT = np.linspace([41, 82, 232], [99, 102, 241], 256).astype(np.uint8)
+
 def create_modern_icon(size):
-    """创建简洁扁平科幻风格的 iLauncher 图标"""
-    
-    # 创建高分辨率画布（2倍采样）
-    render_size = size * 2
-    img = Image.new('RGBA', (render_size, render_size), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
-    
-    center = render_size // 2
-    padding = render_size // 10
-    
+    """创建简洁扁平科幻风格的 iLauncher 图标（直接按给定尺寸绘制）"""
+
+    center = size // 2
+    padding = size // 10
+
     # === 1. 扁平渐变背景圆形 - 科幻感蓝紫色 ===
-    # 使用简单的双色渐变
-    for i in range(50):
-        ratio = i / 50
-        radius = int((render_size // 2 - padding) * (1 - ratio * 0.15))
-        
-        # 深空蓝到电光蓝
-        r = int(41 + (99 - 41) * ratio)      # #2952E8 -> #6366F1
-        g = int(82 + (102 - 82) * ratio)
-        b = int(232 + (241 - 232) * ratio)
-        
-        draw.ellipse(
-            [center - radius, center - radius, center + radius, center + radius],
-            fill=(r, g, b, 255)
-        )
-    
+    # 用 NumPy 一次性生成双色渐变：外缘 15% 为过渡带，内部为纯电光蓝；
+    # 过渡量化成 256 级后查 GRADIENT_LUT，替代逐像素浮点插值
+    bg_radius = size // 2 - padding
+    yy, xx = np.ogrid[:size, :size]
+    dist = np.hypot(xx - center, yy - center)
+    idx = np.clip((1 - dist / bg_radius) / 0.15 * 255, 0, 255).astype(np.uint8)
+    rgba = np.empty((size, size, 4), dtype=np.uint8)
+    rgba[..., :3] = GRADIENT_LUT[idx]
+    rgba[..., 3] = np.where(dist <= bg_radius, 255, 0)
+
+    img = Image.fromarray(rgba, 'RGBA')
+    draw = ImageDraw.Draw(img)
+
     # === 2. 极简搜索图标 - 细线条设计 ===
-    mag_radius = int(render_size * 0.20)
-    mag_thickness = max(5, render_size // 30)  # 更细的线条
+    mag_radius = int(size * 0.20)
+    mag_thickness = max(5, size // 30)  # 更细的线条
     
     # 放大镜圆圈（纯白，无装饰）
     draw.ellipse(
@@ -48,13 +65,11 @@ def create_modern_icon(size):
     )
     
     # === 3. 极简手柄 ===
-    import math
-    angle = math.radians(45)
-    handle_start_x = center + int(mag_radius * math.cos(angle))
-    handle_start_y = center + int(mag_radius * math.sin(angle))
-    handle_length = int(render_size * 0.24)
-    handle_end_x = handle_start_x + int(handle_length * math.cos(angle))
-    handle_end_y = handle_start_y + int(handle_length * math.sin(angle))
+    handle_start_x = center + int(mag_radius * COS45)
+    handle_start_y = center + int(mag_radius * SIN45)
+    handle_length = int(size * 0.24)
+    handle_end_x = handle_start_x + int(handle_length * COS45)
+    handle_end_y = handle_start_y + int(handle_length * SIN45)
     
     # 手柄（纯白直线）
     draw.line(
@@ -63,46 +78,53 @@ def create_modern_icon(size):
         width=mag_thickness
     )
     
-    # === 4. 科幻点缀：扫描线效果（右上角） ===
-    scan_x = center + int(render_size * 0.28)
-    scan_y = center - int(render_size * 0.28)
-    scan_size = int(render_size * 0.12)
-    
-    # 绘制简洁的扫描圆环
+    # === 4+5. 科幻点缀：扫描圆环 + 光点（右上角） ===
+    # 圆环与发光层都是青色 #64FFDA 的半透明元素，逐个 draw.ellipse 会
+    # 反复扫整张画布；这里把所有元素的 alpha 蒙版用 np.maximum 合成
+    # 一张覆盖层，最后一次性合成回画布
+    scan_x = center + int(size * 0.28)
+    scan_y = center - int(size * 0.28)
+    scan_size = int(size * 0.12)
+
+    overlay_alpha = np.zeros((size, size), dtype=np.uint8)
+
+    # 扫描圆环：3 个同心环，向内逐环变淡，每环 3px 描边
+    ring_dist = np.hypot(xx - scan_x, yy - scan_y)
     for i in range(3):
         ring_radius = scan_size - i * (scan_size // 4)
         alpha = 180 - i * 60
-        draw.ellipse(
-            [scan_x - ring_radius, scan_y - ring_radius,
-             scan_x + ring_radius, scan_y + ring_radius],
-            outline=(100, 255, 218, alpha),  # 青色 #64FFDA
-            width=3
-        )
-    
-    # === 5. 科幻光点 ===
-    # 右下角光点
+        ring = (ring_dist <= ring_radius) & (ring_dist >= ring_radius - 3)
+        np.maximum(overlay_alpha, np.where(ring, alpha, 0).astype(np.uint8),
+                   out=overlay_alpha)
+
+    # 光点：高斯衰减替代原来的多层透明圆叠加
     light_positions = [
-        (center + int(render_size * 0.32), center + int(render_size * 0.20)),
-        (center - int(render_size * 0.30), center - int(render_size * 0.32)),
-        (center + int(render_size * 0.10), center - int(render_size * 0.38)),
+        (center + int(size * 0.32), center + int(size * 0.20)),
+        (center - int(size * 0.30), center - int(size * 0.32)),
+        (center + int(size * 0.10), center - int(size * 0.38)),
     ]
-    
+
+    dot_size = 4
+    sigma = dot_size * 1.5
     for x, y in light_positions:
-        dot_size = 4
-        # 发光效果（多层透明圆）
-        for j in range(3):
-            r = dot_size * (3 - j)
-            alpha = 100 // (j + 1)
-            draw.ellipse(
-                [x - r, y - r, x + r, y + r],
-                fill=(100, 255, 218, alpha)
-            )
-    
+        glow = (100 * np.exp(-((xx - x) ** 2 + (yy - y) ** 2)
+                             / (2 * sigma ** 2))).astype(np.uint8)
+        np.maximum(overlay_alpha, glow, out=overlay_alpha)
+
+    overlay = np.zeros((size, size, 4), dtype=np.uint8)
+    overlay[..., 0] = 100
+    overlay[..., 1] = 255
+    overlay[..., 2] = 218
+    overlay[..., 3] = overlay_alpha
+    img = Image.alpha_composite(img, Image.fromarray(overlay, 'RGBA'))
+    draw = ImageDraw.Draw(img)
+
+
     # === 6. 数字感装饰线 ===
     # 左侧竖线
-    line_x = center - int(render_size * 0.34)
-    line_top = center - int(render_size * 0.15)
-    line_bottom = center + int(render_size * 0.15)
+    line_x = center - int(size * 0.34)
+    line_top = center - int(size * 0.15)
+    line_bottom = center + int(size * 0.15)
     draw.line(
         [(line_x, line_top), (line_x, line_bottom)],
         fill=(255, 255, 255, 60),
@@ -111,8 +133,8 @@ def create_modern_icon(size):
     
     # 右侧短线组
     for i in range(3):
-        line_x = center + int(render_size * 0.30)
-        line_y = center - int(render_size * 0.10) + i * int(render_size * 0.10)
+        line_x = center + int(size * 0.30)
+        line_y = center - int(size * 0.10) + i * int(size * 0.10)
         line_length = 35 - i * 8
         draw.line(
             [(line_x, line_y), (line_x + line_length, line_y)],
@@ -120,27 +142,24 @@ def create_modern_icon(size):
             width=2
         )
     
-    # === 7. 缩小到目标尺寸（抗锯齿） ===
-    img = img.resize((size, size), Image.Resampling.LANCZOS)
-    
     return img
 
-def create_ico_file(png_path, ico_path):
+def resize_from_master(master, rendered, size):
+    """从主画布缩放到指定尺寸，结果缓存在 rendered 里供 ICO/ICNS 复用"""
+    if size not in rendered:
+        rendered[size] = master.resize((size, size), Image.Resampling.LANCZOS)
+    return rendered[size]
+
+def create_ico_file(master, rendered, ico_path):
     """创建 ICO 文件"""
-    img = Image.open(png_path)
     sizes = [(16, 16), (32, 32), (48, 48), (64, 64), (128, 128), (256, 256)]
-    
-    images = []
-    for size in sizes:
-        resized = img.resize(size, Image.Resampling.LANCZOS)
-        images.append(resized)
-    
+
+    images = [resize_from_master(master, rendered, size[0]) for size in sizes]
+
     images[0].save(ico_path, format='ICO', sizes=sizes, append_images=images[1:])
 
-def create_icns_file(png_path, icns_path):
+def create_icns_file(master, rendered, icns_path):
     """创建 ICNS 文件"""
-    img = Image.open(png_path)
-    
     icon_types = [
         (512, b'ic09'),
         (256, b'ic08'),
@@ -148,70 +167,92 @@ def create_icns_file(png_path, icns_path):
         (32, b'ic11'),
         (16, b'ic04'),
     ]
-    
+
     icon_data = []
-    
+
     for size, type_code in icon_types:
-        resized = img.resize((size, size), Image.Resampling.LANCZOS)
-        
+        resized = resize_from_master(master, rendered, size)
+
         png_buffer = io.BytesIO()
         resized.save(png_buffer, format='PNG')
         png_bytes = png_buffer.getvalue()
-        
-        chunk_size = 8 + len(png_bytes)
-        chunk = type_code + struct.pack('>I', chunk_size) + png_bytes
-        icon_data.append(chunk)
-    
+
+        icon_data.append(ICNS_HEADER.pack(type_code, 8 + len(png_bytes)) + png_bytes)
+
+    # 整个文件拼成一个缓冲区，一次写入
+    payload = b''.join(icon_data)
     with open(icns_path, 'wb') as f:
-        total_size = 8 + sum(len(chunk) for chunk in icon_data)
-        f.write(b'icns')
-        f.write(struct.pack('>I', total_size))
-        for chunk in icon_data:
-            f.write(chunk)
-
-def main():
-    icons_dir = os.path.join(os.path.dirname(__file__), '..', 'src-tauri', 'icons')
-    
+        f.write(ICNS_HEADER.pack(b'icns', 8 + len(payload)) + payload)
+
+def init_worker(master_bytes):
+    """进程池初始化：还原主画布供本进程所有任务复用"""
+    global _master
+    _master = Image.frombytes('RGBA', (MASTER_SIZE, MASTER_SIZE), master_bytes)
+
+def render_one(task):
+    """将主画布缩放到单个尺寸并保存（进程池工作函数）"""
+    filename, size = task
+    if size == MASTER_SIZE:
+        icon = _master
+    else:
+        icon = _master.resize((size, size), Image.Resampling.LANCZOS)
+    # 批量输出用最低压缩档，省下的是纯 CPU 时间；icon.png 随后会重新压缩
+    icon.save(os.path.join(ICONS_DIR, filename), 'PNG', compress_level=1)
+    return filename, size
+
+def render_one_hifi(task):
+    """逐尺寸独立重绘并保存（--high-fidelity 模式的进程池工作函数）"""
+    filename, size = task
+    icon = create_modern_icon(size)
+    icon.save(os.path.join(ICONS_DIR, filename), 'PNG', compress_level=1)
+    return filename, size
+
+def main(high_fidelity=False):
+    icons_dir = ICONS_DIR
+
     print("🎨 生成专业手绘图标...\n")
-    
-    # 生成各种尺寸的 PNG
-    sizes = {
-        'icon.png': 512,
-        '32x32.png': 32,
-        '128x128.png': 128,
-        '128x128@2x.png': 256,
-        'Square30x30Logo.png': 30,
-        'Square44x44Logo.png': 44,
-        'Square71x71Logo.png': 71,
-        'Square89x89Logo.png': 89,
-        'Square107x107Logo.png': 107,
-        'Square142x142Logo.png': 142,
-        'Square150x150Logo.png': 150,
-        'Square284x284Logo.png': 284,
-        'Square310x310Logo.png': 310,
-        'StoreLogo.png': 50,
-    }
-    
+
     print("📦 生成 PNG 文件...")
-    for filename, size in sizes.items():
-        icon = create_modern_icon(size)
-        output_path = os.path.join(icons_dir, filename)
-        icon.save(output_path, 'PNG')
-        print(f"  ✓ {filename} ({size}x{size})")
+    # 所有输出都是同一幅图，只绘制一次 1024 主画布，
+    # 每个输出尺寸直接从主画布做一次 LANCZOS 缩放（自带抗锯齿）
+    master = create_modern_icon(MASTER_SIZE)
+
+    if high_fidelity:
+        # 每个尺寸独立重绘（慢，但每个输出都是原生绘制而非缩放）
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            for filename, size in executor.map(render_one_hifi, SIZES, chunksize=1):
+                print(f"  ✓ {filename} ({size}x{size})")
+    else:
+        # 缩放与保存互相独立，用进程池并行处理；SIZES 已按大尺寸优先排序
+        with ProcessPoolExecutor(max_workers=os.cpu_count(),
+                                 initializer=init_worker,
+                                 initargs=(master.tobytes(),)) as executor:
+            for filename, size in executor.map(render_one, SIZES, chunksize=1):
+                print(f"  ✓ {filename} ({size}x{size})")
     
+    # ICO/ICNS 直接复用内存中的主画布，相同尺寸的缩放只算一次
+    rendered = {}
+
+    # 正式对外的 icon.png 用最高压缩档重新保存一次（顺便为 ICNS 预热 512 缓存）
+    resize_from_master(master, rendered, 512).save(
+        os.path.join(icons_dir, 'icon.png'), 'PNG', compress_level=9, optimize=True)
+
     print("\n🪟 生成 Windows ICO...")
-    base_icon_path = os.path.join(icons_dir, 'icon.png')
     ico_path = os.path.join(icons_dir, 'icon.ico')
-    create_ico_file(base_icon_path, ico_path)
+    create_ico_file(master, rendered, ico_path)
     print(f"  ✓ icon.ico")
-    
+
     print("\n🍎 生成 macOS ICNS...")
     icns_path = os.path.join(icons_dir, 'icon.icns')
-    create_icns_file(base_icon_path, icns_path)
+    create_icns_file(master, rendered, icns_path)
     print(f"  ✓ icon.icns")
     
     print("\n✨ 专业图标生成完成！")
     print(f"📁 输出目录: {icons_dir}")
 
 if __name__ == '__main__':
-    main()
+    parser = argparse.ArgumentParser(description='生成专业版 iLauncher 图标')
+    parser.add_argument('--high-fidelity', action='store_true',
+                        help='每个尺寸独立重绘，而不是从主画布缩放')
+    args = parser.parse_args()
+    main(high_fidelity=args.high_fidelity)